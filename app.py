@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from portfolio_logic import calculate_portfolio_data, get_historical_performance, ISIN_MAP
+from portfolio_logic import calculate_portfolio_data, get_historical_performance, get_monthly_returns, ISIN_MAP
 
 # --- CONFIG ---
 st.set_page_config(page_title="Portfolio Terminal", layout="wide")
@@ -436,15 +436,7 @@ with col_main:
     st.write("##")
     st.subheader("🗓️ Monatliche Performance & YTD")
     if not h_df.empty:
-        h_copy = h_df.copy()
-        h_copy['Datum'] = pd.to_datetime(h_copy['Datum'])
-        h_copy['Jahr'] = h_copy['Datum'].dt.year
-        h_copy['Monat'] = h_copy['Datum'].dt.month
-       
-        m_df = h_copy.groupby(['Jahr', 'Monat']).agg({'Marktwert_CHF': 'last', 'Einsatz_CHF': 'last'}).reset_index()
-        m_df['Returns'] = m_df['Marktwert_CHF'].pct_change() * 100
-        idx0 = m_df.index[0]
-        m_df.loc[idx0, 'Returns'] = ((m_df.loc[idx0, 'Marktwert_CHF'] / m_df.loc[idx0, 'Einsatz_CHF']) - 1) * 100
+        m_df = get_monthly_returns(h_df)
        
         pivot_heat = m_df.pivot(index='Jahr', columns='Monat', values='Returns')
         pivot_heat['YTD'] = pivot_heat.sum(axis=1)
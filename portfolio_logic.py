@@ -14,6 +14,13 @@ ISIN_MAP = {
 
 
 PORTFOLIO_FILE = 'portfolio.json'
+FX_TICKER = "USDCHF=X"
+
+
+# Handelszeiten pro Börse (Ticker-Suffix -> Zeitzone, Eröffnung, Schluss), Mo-Fr
+EXCHANGE_SESSIONS = {
+    ".SW": ("Europe/Zurich", "09:00", "17:30")  # SIX Swiss Exchange
+}
 
 
 @st.cache_data(ttl=600) # Speichert die Daten für 10 Minuten im RAM
@@ -41,7 +48,7 @@ def calculate_portfolio_data():
    
     # Aktuellen Wechselkurs abrufen
     try:
-        fx_rate = yf.Ticker("USDCHF=X").history(period="1d")['Close'].iloc[-1]
+        fx_rate = yf.Ticker(FX_TICKER).history(period="1d")['Close'].iloc[-1]
     except:
         fx_rate = 1.0
 
@@ -97,6 +104,37 @@ def calculate_portfolio_data():
     }
 
 
+def _session_mask(index, ticker):
+    # True für Zeitpunkte innerhalb der Handelszeit der Börse des Tickers
+    suffix = "." + ticker.rsplit(".", 1)[-1] if "." in ticker else ""
+    session = EXCHANGE_SESSIONS.get(suffix)
+    if session is None:
+        return pd.Series(True, index=index)
+
+    tz, open_time, close_time = session
+    local = index.tz_convert(tz) if index.tz is not None else index.tz_localize("UTC").tz_convert(tz)
+    mask = pd.Series(False, index=index)
+    mask.iloc[local.indexer_between_time(open_time, close_time)] = True
+    return mask & pd.Series(local.dayofweek < 5, index=index)
+
+
+def align_to_sessions(raw_data, tickers, fx_ticker=FX_TICKER):
+    # Nur Bars behalten, an denen mind. ein ETF innerhalb seiner Handelszeit einen echten Kurs hat
+    equity_cols = [t for t in tickers if t in raw_data.columns]
+    equities = raw_data[equity_cols]
+    in_session = pd.Series(False, index=raw_data.index)
+    for ticker in equity_cols:
+        in_session |= equities[ticker].notna() & _session_mask(raw_data.index, ticker)
+
+    grid = equities[in_session].ffill()
+    if fx_ticker not in raw_data.columns:
+        return grid
+
+    # FX (24/5) per As-of-Join auf das ETF-Raster legen: letzter bekannter Kurs <= Bar
+    fx = raw_data[[fx_ticker]].dropna()
+    return pd.merge_asof(grid, fx, left_index=True, right_index=True, direction="backward")
+
+
 @st.cache_data(ttl=600)
 def get_historical_performance():
     if not os.path.exists(PORTFOLIO_FILE):
@@ -123,14 +161,15 @@ def get_historical_performance():
    
     try:
         raw_data = yf.download(
-            tickers + ["USDCHF=X"],
+            tickers + [FX_TICKER],
             start=start_str,
             interval=chosen_interval
         )['Close']
     except:
-        raw_data = yf.download(tickers + ["USDCHF=X"], start=start_str, interval="1h")['Close']
+        raw_data = yf.download(tickers + [FX_TICKER], start=start_str, interval="1h")['Close']
        
-    raw_data = raw_data.ffill()
+    # Statt ffill über den gemischten Index: ETF-Handelszeiten als Raster, FX darauf ausrichten
+    raw_data = align_to_sessions(raw_data.sort_index(), tickers)
    
     history_list = []
     for timestamp in raw_data.index:
@@ -150,7 +189,7 @@ def get_historical_performance():
                
                 if ticker in raw_data.columns:
                     p = raw_data.loc[timestamp, ticker]
-                    f = raw_data.loc[timestamp, "USDCHF=X"] if t['currency_rate'] != 1.0 else 1.0
+                    f = raw_data.loc[timestamp, FX_TICKER] if t['currency_rate'] != 1.0 else 1.0
                    
                     if pd.notna(p) and pd.notna(f):
                         current_day_val += (t['quantity'] * p * f)
@@ -162,4 +201,21 @@ def get_historical_performance():
                 "Einsatz_CHF": current_day_invested
             })
            
-    return pd.DataFrame(history_list)
\ No newline at end of file
+    return pd.DataFrame(history_list)
+
+
+def get_monthly_returns(h_df):
+    # Monatsrenditen aus dem Verlauf (letzter Wert pro Monat)
+    if h_df.empty:
+        return pd.DataFrame(columns=['Jahr', 'Monat', 'Marktwert_CHF', 'Einsatz_CHF', 'Returns'])
+    h_copy = h_df.copy()
+    h_copy['Datum'] = pd.to_datetime(h_copy['Datum'])
+    h_copy['Jahr'] = h_copy['Datum'].dt.year
+    h_copy['Monat'] = h_copy['Datum'].dt.month
+
+    m_df = h_copy.groupby(['Jahr', 'Monat']).agg({'Marktwert_CHF': 'last', 'Einsatz_CHF': 'last'}).reset_index()
+    m_df['Returns'] = m_df['Marktwert_CHF'].pct_change() * 100
+    # Erster Monat: Performance gegenüber dem Einsatz
+    idx0 = m_df.index[0]
+    m_df.loc[idx0, 'Returns'] = ((m_df.loc[idx0, 'Marktwert_CHF'] / m_df.loc[idx0, 'Einsatz_CHF']) - 1) * 100
+    return m_df
@@ -0,0 +1,182 @@
+import os
+import json
+import argparse
+import pandas as pd
+from datetime import datetime
+from portfolio_logic import calculate_portfolio_data, get_historical_performance, get_monthly_returns
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Konfiguration
+EXPORT_DIR = 'exports'
+ROWS_PER_CHUNK = 50_000  # Zeilen pro Schreibvorgang (Row Group / CSV-Block)
+
+
+# Feste Spaltentypen, damit Parquet und CSV dieselben Typen liefern
+SCHEMAS = {
+    "positions": {
+        "Name": "string",
+        "Ticker": "string",
+        "Menge": "float64",
+        "Wert (CHF)": "float64",
+        "Investiert (CHF)": "float64",
+        "Stock Gain": "float64",
+        "FX Gain": "float64",
+        "Total Gain": "float64",
+        "Gebühren": "float64"
+    },
+    "history": {
+        "Datum": "datetime64[ns, UTC]",
+        "Marktwert_CHF": "float64",
+        "Einsatz_CHF": "float64"
+    },
+    "monthly_returns": {
+        "Jahr": "int64",
+        "Monat": "int64",
+        "Marktwert_CHF": "float64",
+        "Einsatz_CHF": "float64",
+        "Returns": "float64"
+    }
+}
+
+# Partitionsspalte pro Tabelle (Hive-Stil: <spalte>=<wert>/)
+PARTITION_COLS = {
+    "positions": "datum",
+    "history": "datum",
+    "monthly_returns": "monat"
+}
+
+
+def _apply_schema(df, table):
+    schema = SCHEMAS[table]
+    df = df.reindex(columns=list(schema))
+    for col, dtype in schema.items():
+        if dtype.startswith("datetime64"):
+            df[col] = pd.to_datetime(df[col], utc=True)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def _existing_partitions(table_dir, part_col):
+    if not os.path.isdir(table_dir):
+        return []
+    prefix = f"{part_col}="
+    return sorted(d[len(prefix):] for d in os.listdir(table_dir) if d.startswith(prefix))
+
+
+def _write_partition(df, part_dir, fmt):
+    # Erst in eine versteckte Temp-Datei schreiben, dann atomar ersetzen
+    os.makedirs(part_dir, exist_ok=True)
+    target = os.path.join(part_dir, f"part-0.{fmt}")
+    tmp = os.path.join(part_dir, f".part-0.{fmt}.tmp")
+
+    if fmt == "parquet":
+        arrow_schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+        with pq.ParquetWriter(tmp, arrow_schema) as writer:
+            for start in range(0, len(df), ROWS_PER_CHUNK):
+                chunk = df.iloc[start:start + ROWS_PER_CHUNK]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=arrow_schema, preserve_index=False))
+    else:
+        for start in range(0, len(df), ROWS_PER_CHUNK):
+            chunk = df.iloc[start:start + ROWS_PER_CHUNK]
+            chunk.to_csv(tmp, mode='w' if start == 0 else 'a', header=(start == 0), index=False)
+
+    os.replace(tmp, target)
+
+
+def write_table(df, table, export_dir=EXPORT_DIR, fmt="parquet"):
+    if fmt not in ("parquet", "csv"):
+        raise Exception(f"Unbekanntes Format '{fmt}' (erlaubt: parquet, csv).")
+    if fmt == "parquet" and pa is None:
+        raise Exception("Für den Parquet-Export wird 'pyarrow' benötigt.")
+
+    part_col = PARTITION_COLS[table]
+    table_dir = os.path.join(export_dir, table)
+    df = _apply_schema(df, table)
+
+    if fmt == "csv":
+        # Spaltentypen neben den CSV-Dateien ablegen, damit nachgelagerte Jobs typisiert lesen können
+        os.makedirs(table_dir, exist_ok=True)
+        with open(os.path.join(table_dir, "_schema.json"), 'w') as f:
+            json.dump(SCHEMAS[table], f, indent=2)
+
+    if df.empty:
+        return []
+
+    if table == "monthly_returns":
+        keys = df['Jahr'].astype(str) + "-" + df['Monat'].astype(str).str.zfill(2)
+    elif table == "history":
+        keys = df['Datum'].dt.strftime("%Y-%m-%d")
+    else:
+        keys = pd.Series(datetime.now().strftime("%Y-%m-%d"), index=df.index)
+
+    # Inkrementell: bestehende Partitionen bleiben liegen, nur die letzte
+    # (evtl. noch unvollständige) wird neu geschrieben
+    existing = _existing_partitions(table_dir, part_col)
+    last_existing = existing[-1] if existing else None
+
+    written = []
+    for key, part_df in df.groupby(keys, sort=True):
+        if last_existing is not None and key < last_existing:
+            continue
+        _write_partition(part_df, os.path.join(table_dir, f"{part_col}={key}"), fmt)
+        written.append(key)
+    return written
+
+
+def read_table(table, export_dir=EXPORT_DIR, partitions=None):
+    # Liest eine exportierte Tabelle, optional nur ausgewählte Partitionen
+    part_col = PARTITION_COLS[table]
+    table_dir = os.path.join(export_dir, table)
+    keys = _existing_partitions(table_dir, part_col)
+    if partitions is not None:
+        wanted = set(partitions)
+        keys = [k for k in keys if k in wanted]
+
+    frames = []
+    for key in keys:
+        part_dir = os.path.join(table_dir, f"{part_col}={key}")
+        for fname in sorted(os.listdir(part_dir)):
+            path = os.path.join(part_dir, fname)
+            if fname.endswith(".parquet"):
+                part_df = pd.read_parquet(path)
+            elif fname.endswith(".csv"):
+                part_df = pd.read_csv(path)
+            else:
+                continue
+            part_df[part_col] = key
+            frames.append(part_df)
+
+    if not frames:
+        return pd.DataFrame(columns=list(SCHEMAS[table]) + [part_col])
+    df = pd.concat(frames, ignore_index=True)
+    return pd.concat([_apply_schema(df, table), df[[part_col]]], axis=1)
+
+
+def export_snapshot(export_dir=EXPORT_DIR, fmt="parquet"):
+    data_pkg = calculate_portfolio_data()
+    h_df = get_historical_performance()
+
+    return {
+        "positions": write_table(data_pkg['df'], "positions", export_dir, fmt),
+        "history": write_table(h_df, "history", export_dir, fmt),
+        "monthly_returns": write_table(get_monthly_returns(h_df), "monthly_returns", export_dir, fmt)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportiert Positionen, Verlauf und Monatsrenditen.")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--out", default=EXPORT_DIR)
+    args = parser.parse_args()
+
+    written = export_snapshot(args.out, args.format)
+    for table, keys in written.items():
+        print(f"{table:<16} | {len(keys)} Partition(en) geschrieben")